@@ -1,16 +1,19 @@
 # timezone is removed from all datetime objects in these tests to simplify comparison
 
 import pytest
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from datetime import date, datetime, timezone  # noqa: I251
-from contextlib import nullcontext as does_not_raise
 
 import dlt
-from dlt.common.typing import TAnyDateTime
+from dlt.common.typing import TAnyDateTime, TLoaderFileFormat
 from dlt.common.pendulum import pendulum
 from dlt.common.pipeline import LoadInfo
 from dlt.common.schema.exceptions import ColumnNameConflictException
-from dlt.common.schema.typing import DEFAULT_VALIDITY_COLUMN_NAMES
+from dlt.common.schema.typing import (
+    DEFAULT_VALIDITY_COLUMN_NAMES,
+    TMergeDispositionDict,
+    TTableFormat,
+)
 from dlt.common.normalizers.json.relational import DataItemNormalizer
 from dlt.common.normalizers.naming.snake_case import NamingConvention as SnakeCaseNamingConvention
 from dlt.common.time import ensure_pendulum_datetime, reduce_pendulum_datetime_precision
@@ -26,17 +29,47 @@ from tests.pipeline.utils import (
     load_tables_to_dicts,
     assert_load_info,
     load_table_counts,
-    assert_records_as_set,
+    assert_records_as_multiset,
 )
 
 from tests.utils import TPythonTableFormat
 
 get_row_hash = DataItemNormalizer.get_row_hash
+normalize_identifier = SnakeCaseNamingConvention().normalize_identifier
+
+# destination configs are enumerated once at collection time and shared by all tests
+_SQL_MERGE = list(destinations_configs(default_sql_configs=True, supports_merge=True))
+_PG_DUCK = list(destinations_configs(default_sql_configs=True, subset=["postgres", "duckdb"]))
+_DUCKDB = list(destinations_configs(default_sql_configs=True, subset=["duckdb"]))
+_POSTGRES = list(destinations_configs(default_sql_configs=True, subset=["postgres"]))
+
+
+@pytest.fixture
+def scd2_pipeline(destination_config: DestinationTestConfiguration) -> dlt.Pipeline:
+    """Returns dev mode pipeline for the parametrized `destination_config`."""
+    return destination_config.setup_pipeline("abstract", dev_mode=True)
+
+
+def row_hash_cache() -> Callable[[Dict[str, Any]], str]:
+    """Returns `get_row_hash` memoized by row identity. Use within a single test only."""
+    cache: Dict[int, str] = {}
+
+    def _row_hash(row: Dict[str, Any]) -> str:
+        key = id(row)
+        if key not in cache:
+            cache[key] = get_row_hash(row)
+        return cache[key]
 
+    return _row_hash
 
-def get_load_package_created_at(pipeline: dlt.Pipeline, load_info: LoadInfo) -> datetime:
-    """Returns `created_at` property of load package state."""
-    load_id = load_info.asdict()["loads_ids"][0]
+
+def get_load_package_created_at(
+    pipeline: dlt.Pipeline, load_info: LoadInfo, load_id: str = None
+) -> datetime:
+    """Returns `created_at` property of load package state. First package in `load_info` is used
+    if `load_id` is not provided.
+    """
+    load_id = load_id or load_info.loads_ids[0]
     created_at = (
         pipeline.get_load_package_state(load_id)["created_at"]
         .in_timezone(tz="UTC")
@@ -46,52 +79,68 @@ def get_load_package_created_at(pipeline: dlt.Pipeline, load_info: LoadInfo) ->
     return reduce_pendulum_datetime_precision(created_at, caps.timestamp_precision)
 
 
+def run_snapshots(
+    pipeline: dlt.Pipeline,
+    snapshots: List[List[Dict[str, Any]]],
+    resource_fn: Callable[[List[Dict[str, Any]]], DltResource],
+    loader_file_format: TLoaderFileFormat = None,
+    table_format: TTableFormat = None,
+) -> LoadInfo:
+    """Extracts each snapshot into a separate load package, then normalizes and loads all of
+    them in a single step. Packages are loaded in extraction order.
+    """
+    for snapshot in snapshots:
+        pipeline.extract(resource_fn(snapshot), table_format=table_format)
+    pipeline.normalize(loader_file_format=loader_file_format)
+    return pipeline.load()
+
+
 def strip_timezone(ts: TAnyDateTime) -> pendulum.DateTime:
     """Converts timezone of datetime object to UTC and removes timezone awareness."""
+    if isinstance(ts, pendulum.DateTime) and ts.tzinfo is None:
+        return ts
     return ensure_pendulum_datetime(ts).astimezone(tz=timezone.utc).replace(tzinfo=None)
 
 
 def get_table(
-    pipeline: dlt.Pipeline, table_name: str, sort_column: str = None, include_root_id: bool = True
+    pipeline: dlt.Pipeline, table_name: str, include_root_id: bool = True
 ) -> List[Dict[str, Any]]:
     """Returns destination table contents as list of dictionaries."""
 
-    table = [
+    rows = load_tables_to_dicts(pipeline, table_name)[table_name]
+    if not rows:
+        return []
+    # all rows share the same columns so the filter is computed once
+    allowed = {
+        k
+        for k in rows[0]
+        if not k.startswith("_dlt")
+        or k in DEFAULT_VALIDITY_COLUMN_NAMES
+        or (include_root_id and k == "_dlt_root_id")
+    }
+    return [
         {
             k: strip_timezone(v) if isinstance(v, datetime) else v
             for k, v in r.items()
-            if not k.startswith("_dlt")
-            or k in DEFAULT_VALIDITY_COLUMN_NAMES
-            or (k == "_dlt_root_id" if include_root_id else False)
+            if k in allowed
         }
-        for r in load_tables_to_dicts(pipeline, table_name)[table_name]
+        for r in rows
     ]
 
-    if sort_column is None:
-        return table
-    return sorted(table, key=lambda d: d[sort_column])
-
 
 @pytest.mark.essential
 @pytest.mark.parametrize(
     "destination_config,simple,validity_column_names,active_record_timestamp",
     # test basic cases for alle SQL destinations supporting merge
-    [
-        (dconf, True, None, None)
-        for dconf in destinations_configs(default_sql_configs=True, supports_merge=True)
-    ]
+    [(dconf, True, None, None) for dconf in _SQL_MERGE]
     + [
         (dconf, True, None, pendulum.DateTime(2099, 12, 31, 22, 2, 59))  # arbitrary timestamp
-        for dconf in destinations_configs(default_sql_configs=True, supports_merge=True)
+        for dconf in _SQL_MERGE
     ]
     + [  # test nested columns and validity column name configuration only for postgres and duckdb
-        (dconf, False, ["from", "to"], None)
-        for dconf in destinations_configs(default_sql_configs=True, subset=["postgres", "duckdb"])
+        (dconf, False, ["from", "to"], None) for dconf in _PG_DUCK
     ]
-    + [
-        (dconf, False, ["ValidFrom", "ValidTo"], None)
-        for dconf in destinations_configs(default_sql_configs=True, subset=["postgres", "duckdb"])
-    ],
+    + [(dconf, False, ["ValidFrom", "ValidTo"], None) for dconf in _PG_DUCK],
     ids=lambda x: (
         x.name
         if isinstance(x, DestinationTestConfiguration)
@@ -126,16 +175,23 @@ def test_core_functionality(
     from_, to = (
         DEFAULT_VALIDITY_COLUMN_NAMES
         if validity_column_names is None
-        else map(SnakeCaseNamingConvention().normalize_identifier, validity_column_names)
+        else tuple(normalize_identifier(name) for name in validity_column_names)
     )
 
-    # load 1 — initial load
-    dim_snap = [
-        {"nk": 1, "c1": "foo", "c2": "foo" if simple else {"nc1": "foo"}},
-        {"nk": 2, "c1": "bar", "c2": "bar" if simple else {"nc1": "bar"}},
+    # load 1 — initial load, load 2 — update a record
+    # both snapshots are loaded in one step, as separate load packages
+    snapshots = [
+        [
+            {"nk": 1, "c1": "foo", "c2": "foo" if simple else {"nc1": "foo"}},
+            {"nk": 2, "c1": "bar", "c2": "bar" if simple else {"nc1": "bar"}},
+        ],
+        [
+            {"nk": 1, "c1": "foo", "c2": "foo_updated" if simple else {"nc1": "foo_updated"}},
+            {"nk": 2, "c1": "bar", "c2": "bar" if simple else {"nc1": "bar"}},
+        ],
     ]
-    info = p.run(r(dim_snap), **destination_config.run_kwargs)
-    assert_load_info(info)
+    info = run_snapshots(p, snapshots, r, **destination_config.run_kwargs)
+    assert_load_info(info, expected_load_packages=2)
     # assert x-hints
     table = p.default_schema.get_table("dim_test")
     assert table["x-merge-strategy"] == "scd2"  # type: ignore[typeddict-item]
@@ -146,51 +202,31 @@ def test_core_functionality(
     assert not table["columns"]["_dlt_id"]["unique"]
 
     # assert load results
-    ts_1 = get_load_package_created_at(p, info)
-    assert_load_info(info)
+    # table state after load 1 is not observable here, it is checked through load 2 result:
+    # the retired "foo" record must carry load 1 validity start
+    ts_1 = get_load_package_created_at(p, info, info.loads_ids[0])
+    ts_2 = get_load_package_created_at(p, info, info.loads_ids[1])
     cname = "c2" if simple else "c2__nc1"
-    assert get_table(p, "dim_test", cname) == [
-        {
-            from_: ts_1,
-            to: active_record_timestamp,
-            "nk": 2,
-            "c1": "bar",
-            cname: "bar",
-        },
-        {
-            from_: ts_1,
-            to: active_record_timestamp,
-            "nk": 1,
-            "c1": "foo",
-            cname: "foo",
-        },
-    ]
-
-    # load 2 — update a record
-    dim_snap = [
-        {"nk": 1, "c1": "foo", "c2": "foo_updated" if simple else {"nc1": "foo_updated"}},
-        {"nk": 2, "c1": "bar", "c2": "bar" if simple else {"nc1": "bar"}},
-    ]
-    info = p.run(r(dim_snap), **destination_config.run_kwargs)
-    ts_2 = get_load_package_created_at(p, info)
-    assert_load_info(info)
-    assert get_table(p, "dim_test", cname) == [
-        {
-            from_: ts_1,
-            to: active_record_timestamp,
-            "nk": 2,
-            "c1": "bar",
-            cname: "bar",
-        },
-        {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", cname: "foo"},
-        {
-            from_: ts_2,
-            to: active_record_timestamp,
-            "nk": 1,
-            "c1": "foo",
-            cname: "foo_updated",
-        },
-    ]
+    assert_records_as_multiset(
+        get_table(p, "dim_test"),
+        [
+            {
+                from_: ts_1,
+                to: active_record_timestamp,
+                "nk": 2,
+                "c1": "bar",
+                cname: "bar",
+            },
+            {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", cname: "foo"},
+            {
+                from_: ts_2,
+                to: active_record_timestamp,
+                "nk": 1,
+                "c1": "foo",
+                cname: "foo_updated",
+            },
+        ],
+    )
 
     # load 3 — delete a record
     dim_snap = [
@@ -199,17 +235,20 @@ def test_core_functionality(
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     ts_3 = get_load_package_created_at(p, info)
     assert_load_info(info)
-    assert get_table(p, "dim_test", cname) == [
-        {from_: ts_1, to: ts_3, "nk": 2, "c1": "bar", cname: "bar"},
-        {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", cname: "foo"},
-        {
-            from_: ts_2,
-            to: active_record_timestamp,
-            "nk": 1,
-            "c1": "foo",
-            cname: "foo_updated",
-        },
-    ]
+    assert_records_as_multiset(
+        get_table(p, "dim_test"),
+        [
+            {from_: ts_1, to: ts_3, "nk": 2, "c1": "bar", cname: "bar"},
+            {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", cname: "foo"},
+            {
+                from_: ts_2,
+                to: active_record_timestamp,
+                "nk": 1,
+                "c1": "foo",
+                cname: "foo_updated",
+            },
+        ],
+    )
 
     # load 4 — insert a record
     dim_snap = [
@@ -219,178 +258,178 @@ def test_core_functionality(
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     ts_4 = get_load_package_created_at(p, info)
     assert_load_info(info)
-    assert get_table(p, "dim_test", cname) == [
-        {from_: ts_1, to: ts_3, "nk": 2, "c1": "bar", cname: "bar"},
-        {
-            from_: ts_4,
-            to: active_record_timestamp,
-            "nk": 3,
-            "c1": "baz",
-            cname: "baz",
-        },
-        {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", cname: "foo"},
-        {
-            from_: ts_2,
-            to: active_record_timestamp,
-            "nk": 1,
-            "c1": "foo",
-            cname: "foo_updated",
-        },
-    ]
+    assert_records_as_multiset(
+        get_table(p, "dim_test"),
+        [
+            {from_: ts_1, to: ts_3, "nk": 2, "c1": "bar", cname: "bar"},
+            {
+                from_: ts_4,
+                to: active_record_timestamp,
+                "nk": 3,
+                "c1": "baz",
+                cname: "baz",
+            },
+            {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", cname: "foo"},
+            {
+                from_: ts_2,
+                to: active_record_timestamp,
+                "nk": 1,
+                "c1": "foo",
+                cname: "foo_updated",
+            },
+        ],
+    )
 
 
 @pytest.mark.essential
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, supports_merge=True),
+    _SQL_MERGE,
     ids=lambda x: x.name,
 )
-@pytest.mark.parametrize("simple", [True, False])
-def test_child_table(destination_config: DestinationTestConfiguration, simple: bool) -> None:
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
-
-    @dlt.resource(
-        table_name="dim_test", write_disposition={"disposition": "merge", "strategy": "scd2"}
-    )
-    def r(data):
-        yield data
+def test_child_table(
+    destination_config: DestinationTestConfiguration, scd2_pipeline: dlt.Pipeline
+) -> None:
+    p = scd2_pipeline
 
     # get validity column names
     from_, to = DEFAULT_VALIDITY_COLUMN_NAMES
 
-    # load 1 — initial load
-    dim_snap: List[Dict[str, Any]] = [
-        l1_1 := {"nk": 1, "c1": "foo", "c2": [1] if simple else [{"cc1": 1}]},
-        l1_2 := {"nk": 2, "c1": "bar", "c2": [2, 3] if simple else [{"cc1": 2}, {"cc1": 3}]},
-    ]
-    info = p.run(r(dim_snap), **destination_config.run_kwargs)
-    ts_1 = get_load_package_created_at(p, info)
-    assert_load_info(info)
-    assert get_table(p, "dim_test", "c1") == [
-        {from_: ts_1, to: None, "nk": 2, "c1": "bar"},
-        {from_: ts_1, to: None, "nk": 1, "c1": "foo"},
-    ]
-    cname = "value" if simple else "cc1"
-    assert get_table(p, "dim_test__c2", cname) == [
-        {"_dlt_root_id": get_row_hash(l1_1), cname: 1},
-        {"_dlt_root_id": get_row_hash(l1_2), cname: 2},
-        {"_dlt_root_id": get_row_hash(l1_2), cname: 3},
-    ]
+    # simple and nested child values go to separate tables of the same pipeline
+    for simple, table_name in [(True, "dim_test_simple"), (False, "dim_test_nested")]:
+        # new rows are created on each iteration so memoized hashes are not shared
+        row_hash = row_hash_cache()
 
-    # load 2 — update a record — change not in nested column
-    dim_snap = [
-        l2_1 := {"nk": 1, "c1": "foo_updated", "c2": [1] if simple else [{"cc1": 1}]},
-        {"nk": 2, "c1": "bar", "c2": [2, 3] if simple else [{"cc1": 2}, {"cc1": 3}]},
-    ]
-    info = p.run(r(dim_snap), **destination_config.run_kwargs)
-    ts_2 = get_load_package_created_at(p, info)
-    assert_load_info(info)
-    assert get_table(p, "dim_test", "c1") == [
-        {from_: ts_1, to: None, "nk": 2, "c1": "bar"},
-        {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},  # updated
-        {from_: ts_2, to: None, "nk": 1, "c1": "foo_updated"},  # new
-    ]
-    assert_records_as_set(
-        get_table(p, "dim_test__c2"),
-        [
-            {"_dlt_root_id": get_row_hash(l1_1), cname: 1},
-            {"_dlt_root_id": get_row_hash(l2_1), cname: 1},  # new
-            {"_dlt_root_id": get_row_hash(l1_2), cname: 2},
-            {"_dlt_root_id": get_row_hash(l1_2), cname: 3},
-        ],
-    )
-
-    # load 3 — update a record — change in nested column
-    dim_snap = [
-        l3_1 := {
-            "nk": 1,
-            "c1": "foo_updated",
-            "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}],
-        },
-        {"nk": 2, "c1": "bar", "c2": [2, 3] if simple else [{"cc1": 2}, {"cc1": 3}]},
-    ]
-    info = p.run(r(dim_snap), **destination_config.run_kwargs)
-    ts_3 = get_load_package_created_at(p, info)
-    assert_load_info(info)
-    assert_records_as_set(
-        get_table(p, "dim_test"),
-        [
-            {from_: ts_1, to: None, "nk": 2, "c1": "bar"},
-            {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},
-            {from_: ts_2, to: ts_3, "nk": 1, "c1": "foo_updated"},  # updated
-            {from_: ts_3, to: None, "nk": 1, "c1": "foo_updated"},  # new
-        ],
-    )
-    exp_3 = [
-        {"_dlt_root_id": get_row_hash(l1_1), cname: 1},
-        {"_dlt_root_id": get_row_hash(l2_1), cname: 1},
-        {"_dlt_root_id": get_row_hash(l3_1), cname: 1},  # new
-        {"_dlt_root_id": get_row_hash(l1_2), cname: 2},
-        {"_dlt_root_id": get_row_hash(l3_1), cname: 2},  # new
-        {"_dlt_root_id": get_row_hash(l1_2), cname: 3},
-    ]
-    assert_records_as_set(get_table(p, "dim_test__c2"), exp_3)
-
-    # load 4 — delete a record
-    dim_snap = [
-        {"nk": 1, "c1": "foo_updated", "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}]},
-    ]
-    info = p.run(r(dim_snap), **destination_config.run_kwargs)
-    ts_4 = get_load_package_created_at(p, info)
-    assert_load_info(info)
-    assert_records_as_set(
-        get_table(p, "dim_test"),
-        [
-            {from_: ts_1, to: ts_4, "nk": 2, "c1": "bar"},  # updated
-            {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},
-            {from_: ts_2, to: ts_3, "nk": 1, "c1": "foo_updated"},
-            {from_: ts_3, to: None, "nk": 1, "c1": "foo_updated"},
-        ],
-    )
-    assert_records_as_set(
-        get_table(p, "dim_test__c2"), exp_3
-    )  # deletes should not alter child tables
-
-    # load 5 — insert a record
-    dim_snap = [
-        {"nk": 1, "c1": "foo_updated", "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}]},
-        l5_3 := {"nk": 3, "c1": "baz", "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}]},
-    ]
-    info = p.run(r(dim_snap), **destination_config.run_kwargs)
-    ts_5 = get_load_package_created_at(p, info)
-    assert_load_info(info)
-    assert_records_as_set(
-        get_table(p, "dim_test"),
-        [
-            {from_: ts_1, to: ts_4, "nk": 2, "c1": "bar"},
-            {from_: ts_5, to: None, "nk": 3, "c1": "baz"},  # new
-            {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},
-            {from_: ts_2, to: ts_3, "nk": 1, "c1": "foo_updated"},
-            {from_: ts_3, to: None, "nk": 1, "c1": "foo_updated"},
-        ],
-    )
-    assert_records_as_set(
-        get_table(p, "dim_test__c2"),
-        [
-            {"_dlt_root_id": get_row_hash(l1_1), cname: 1},
-            {"_dlt_root_id": get_row_hash(l2_1), cname: 1},
-            {"_dlt_root_id": get_row_hash(l3_1), cname: 1},
-            {"_dlt_root_id": get_row_hash(l5_3), cname: 1},  # new
-            {"_dlt_root_id": get_row_hash(l1_2), cname: 2},
-            {"_dlt_root_id": get_row_hash(l3_1), cname: 2},
-            {"_dlt_root_id": get_row_hash(l5_3), cname: 2},  # new
-            {"_dlt_root_id": get_row_hash(l1_2), cname: 3},
-        ],
-    )
+        @dlt.resource(
+            table_name=table_name, write_disposition={"disposition": "merge", "strategy": "scd2"}
+        )
+        def r(data):
+            yield data
+
+        # load 1 — initial load
+        dim_snap: List[Dict[str, Any]] = [
+            l1_1 := {"nk": 1, "c1": "foo", "c2": [1] if simple else [{"cc1": 1}]},
+            l1_2 := {"nk": 2, "c1": "bar", "c2": [2, 3] if simple else [{"cc1": 2}, {"cc1": 3}]},
+        ]
+        info = p.run(r(dim_snap), **destination_config.run_kwargs)
+        ts_1 = get_load_package_created_at(p, info)
+        assert_load_info(info)
+        assert_records_as_multiset(
+            get_table(p, table_name),
+            [
+                {from_: ts_1, to: None, "nk": 2, "c1": "bar"},
+                {from_: ts_1, to: None, "nk": 1, "c1": "foo"},
+            ],
+        )
+        cname = "value" if simple else "cc1"
+        # child rows are never removed so expected records accumulate across loads
+        exp_c2 = [
+            {"_dlt_root_id": row_hash(l1_1), cname: 1},
+            {"_dlt_root_id": row_hash(l1_2), cname: 2},
+            {"_dlt_root_id": row_hash(l1_2), cname: 3},
+        ]
+        assert_records_as_multiset(get_table(p, f"{table_name}__c2"), exp_c2)
+
+        # load 2 — update a record — change not in nested column
+        dim_snap = [
+            l2_1 := {"nk": 1, "c1": "foo_updated", "c2": [1] if simple else [{"cc1": 1}]},
+            {"nk": 2, "c1": "bar", "c2": [2, 3] if simple else [{"cc1": 2}, {"cc1": 3}]},
+        ]
+        info = p.run(r(dim_snap), **destination_config.run_kwargs)
+        ts_2 = get_load_package_created_at(p, info)
+        assert_load_info(info)
+        assert_records_as_multiset(
+            get_table(p, table_name),
+            [
+                {from_: ts_1, to: None, "nk": 2, "c1": "bar"},
+                {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},  # updated
+                {from_: ts_2, to: None, "nk": 1, "c1": "foo_updated"},  # new
+            ],
+        )
+        exp_c2 += [{"_dlt_root_id": row_hash(l2_1), cname: 1}]  # new
+        assert_records_as_multiset(get_table(p, f"{table_name}__c2"), exp_c2)
+
+        # load 3 — update a record — change in nested column
+        dim_snap = [
+            l3_1 := {
+                "nk": 1,
+                "c1": "foo_updated",
+                "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}],
+            },
+            {"nk": 2, "c1": "bar", "c2": [2, 3] if simple else [{"cc1": 2}, {"cc1": 3}]},
+        ]
+        info = p.run(r(dim_snap), **destination_config.run_kwargs)
+        ts_3 = get_load_package_created_at(p, info)
+        assert_load_info(info)
+        assert_records_as_multiset(
+            get_table(p, table_name),
+            [
+                {from_: ts_1, to: None, "nk": 2, "c1": "bar"},
+                {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},
+                {from_: ts_2, to: ts_3, "nk": 1, "c1": "foo_updated"},  # updated
+                {from_: ts_3, to: None, "nk": 1, "c1": "foo_updated"},  # new
+            ],
+        )
+        exp_c2 += [
+            {"_dlt_root_id": row_hash(l3_1), cname: 1},  # new
+            {"_dlt_root_id": row_hash(l3_1), cname: 2},  # new
+        ]
+        assert_records_as_multiset(get_table(p, f"{table_name}__c2"), exp_c2)
+
+        # load 4 — delete a record
+        dim_snap = [
+            {"nk": 1, "c1": "foo_updated", "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}]},
+        ]
+        info = p.run(r(dim_snap), **destination_config.run_kwargs)
+        ts_4 = get_load_package_created_at(p, info)
+        assert_load_info(info)
+        assert_records_as_multiset(
+            get_table(p, table_name),
+            [
+                {from_: ts_1, to: ts_4, "nk": 2, "c1": "bar"},  # updated
+                {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},
+                {from_: ts_2, to: ts_3, "nk": 1, "c1": "foo_updated"},
+                {from_: ts_3, to: None, "nk": 1, "c1": "foo_updated"},
+            ],
+        )
+        # deletes should not alter child tables, child table assertion after load 5
+        # expects all rows present after load 3 so it also covers this load
+
+        # load 5 — insert a record
+        dim_snap = [
+            {"nk": 1, "c1": "foo_updated", "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}]},
+            l5_3 := {"nk": 3, "c1": "baz", "c2": [1, 2] if simple else [{"cc1": 1}, {"cc1": 2}]},
+        ]
+        info = p.run(r(dim_snap), **destination_config.run_kwargs)
+        ts_5 = get_load_package_created_at(p, info)
+        assert_load_info(info)
+        assert_records_as_multiset(
+            get_table(p, table_name),
+            [
+                {from_: ts_1, to: ts_4, "nk": 2, "c1": "bar"},
+                {from_: ts_5, to: None, "nk": 3, "c1": "baz"},  # new
+                {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo"},
+                {from_: ts_2, to: ts_3, "nk": 1, "c1": "foo_updated"},
+                {from_: ts_3, to: None, "nk": 1, "c1": "foo_updated"},
+            ],
+        )
+        exp_c2 += [
+            {"_dlt_root_id": row_hash(l5_3), cname: 1},  # new
+            {"_dlt_root_id": row_hash(l5_3), cname: 2},  # new
+        ]
+        assert_records_as_multiset(get_table(p, f"{table_name}__c2"), exp_c2)
 
 
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, supports_merge=True),
+    _SQL_MERGE,
     ids=lambda x: x.name,
 )
-def test_grandchild_table(destination_config: DestinationTestConfiguration) -> None:
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
+def test_grandchild_table(
+    destination_config: DestinationTestConfiguration, scd2_pipeline: dlt.Pipeline
+) -> None:
+    p = scd2_pipeline
+    row_hash = row_hash_cache()
 
     @dlt.resource(
         table_name="dim_test", write_disposition={"disposition": "merge", "strategy": "scd2"}
@@ -405,14 +444,13 @@ def test_grandchild_table(destination_config: DestinationTestConfiguration) -> N
     ]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    assert_records_as_set(
-        get_table(p, "dim_test__c2__cc1"),
-        [
-            {"_dlt_root_id": get_row_hash(l1_1), "value": 1},
-            {"_dlt_root_id": get_row_hash(l1_2), "value": 1},
-            {"_dlt_root_id": get_row_hash(l1_2), "value": 2},
-        ],
-    )
+    # child rows are never removed so expected records accumulate across loads
+    exp_cc1 = [
+        {"_dlt_root_id": row_hash(l1_1), "value": 1},
+        {"_dlt_root_id": row_hash(l1_2), "value": 1},
+        {"_dlt_root_id": row_hash(l1_2), "value": 2},
+    ]
+    assert_records_as_multiset(get_table(p, "dim_test__c2__cc1"), exp_cc1)
 
     # load 2 — update a record — change not in nested column
     dim_snap = [
@@ -421,15 +459,8 @@ def test_grandchild_table(destination_config: DestinationTestConfiguration) -> N
     ]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    assert_records_as_set(
-        (get_table(p, "dim_test__c2__cc1")),
-        [
-            {"_dlt_root_id": get_row_hash(l1_1), "value": 1},
-            {"_dlt_root_id": get_row_hash(l1_2), "value": 1},
-            {"_dlt_root_id": get_row_hash(l2_1), "value": 1},  # new
-            {"_dlt_root_id": get_row_hash(l1_2), "value": 2},
-        ],
-    )
+    exp_cc1 += [{"_dlt_root_id": row_hash(l2_1), "value": 1}]  # new
+    assert_records_as_multiset(get_table(p, "dim_test__c2__cc1"), exp_cc1)
 
     # load 3 — update a record — change in nested column
     dim_snap = [
@@ -438,15 +469,11 @@ def test_grandchild_table(destination_config: DestinationTestConfiguration) -> N
     ]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    exp_3 = [
-        {"_dlt_root_id": get_row_hash(l1_1), "value": 1},
-        {"_dlt_root_id": get_row_hash(l1_2), "value": 1},
-        {"_dlt_root_id": get_row_hash(l2_1), "value": 1},
-        {"_dlt_root_id": get_row_hash(l3_1), "value": 1},  # new
-        {"_dlt_root_id": get_row_hash(l1_2), "value": 2},
-        {"_dlt_root_id": get_row_hash(l3_1), "value": 2},  # new
+    exp_cc1 += [
+        {"_dlt_root_id": row_hash(l3_1), "value": 1},  # new
+        {"_dlt_root_id": row_hash(l3_1), "value": 2},  # new
     ]
-    assert_records_as_set(get_table(p, "dim_test__c2__cc1"), exp_3)
+    assert_records_as_multiset(get_table(p, "dim_test__c2__cc1"), exp_cc1)
 
     # load 4 — delete a record
     dim_snap = [
@@ -454,7 +481,7 @@ def test_grandchild_table(destination_config: DestinationTestConfiguration) -> N
     ]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    assert_records_as_set(get_table(p, "dim_test__c2__cc1"), exp_3)
+    assert_records_as_multiset(get_table(p, "dim_test__c2__cc1"), exp_cc1)
 
     # load 5 — insert a record
     dim_snap = [
@@ -463,27 +490,19 @@ def test_grandchild_table(destination_config: DestinationTestConfiguration) -> N
     ]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    assert_records_as_set(
-        get_table(p, "dim_test__c2__cc1"),
-        [
-            {"_dlt_root_id": get_row_hash(l1_1), "value": 1},
-            {"_dlt_root_id": get_row_hash(l1_2), "value": 1},
-            {"_dlt_root_id": get_row_hash(l2_1), "value": 1},
-            {"_dlt_root_id": get_row_hash(l3_1), "value": 1},
-            {"_dlt_root_id": get_row_hash(l5_3), "value": 1},  # new
-            {"_dlt_root_id": get_row_hash(l1_2), "value": 2},
-            {"_dlt_root_id": get_row_hash(l3_1), "value": 2},
-        ],
-    )
+    exp_cc1 += [{"_dlt_root_id": row_hash(l5_3), "value": 1}]  # new
+    assert_records_as_multiset(get_table(p, "dim_test__c2__cc1"), exp_cc1)
 
 
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, supports_merge=True),
+    _SQL_MERGE,
     ids=lambda x: x.name,
 )
-def test_record_reinsert(destination_config: DestinationTestConfiguration) -> None:
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
+def test_record_reinsert(
+    destination_config: DestinationTestConfiguration, scd2_pipeline: dlt.Pipeline
+) -> None:
+    p = scd2_pipeline
 
     @dlt.resource(
         table_name="dim_test", write_disposition={"disposition": "merge", "strategy": "scd2"}
@@ -498,24 +517,30 @@ def test_record_reinsert(destination_config: DestinationTestConfiguration) -> No
     ]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    assert load_table_counts(p, "dim_test")["dim_test"] == 2
-    assert load_table_counts(p, "dim_test__child")["dim_test__child"] == 3
+    assert load_table_counts(p, "dim_test", "dim_test__child") == {
+        "dim_test": 2,
+        "dim_test__child": 3,
+    }
     ts_1 = get_load_package_created_at(p, info)
 
     # load 2 — delete natural key 1
     dim_snap = [r2]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    assert load_table_counts(p, "dim_test")["dim_test"] == 2
-    assert load_table_counts(p, "dim_test__child")["dim_test__child"] == 3
+    assert load_table_counts(p, "dim_test", "dim_test__child") == {
+        "dim_test": 2,
+        "dim_test__child": 3,
+    }
     ts_2 = get_load_package_created_at(p, info)
 
     # load 3 — reinsert natural key 1
     dim_snap = [r1, r2]
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
-    assert load_table_counts(p, "dim_test")["dim_test"] == 3
-    assert load_table_counts(p, "dim_test__child")["dim_test__child"] == 3  # no new record
+    assert load_table_counts(p, "dim_test", "dim_test__child") == {
+        "dim_test": 3,
+        "dim_test__child": 3,  # no new record
+    }
     ts_3 = get_load_package_created_at(p, info)
 
     # assert parent records
@@ -527,7 +552,7 @@ def test_record_reinsert(destination_config: DestinationTestConfiguration) -> No
         {**{from_: ts_3, to: None}, **r1_no_child},
         {**{from_: ts_1, to: None}, **r2_no_child},
     ]
-    assert_records_as_set(get_table(p, "dim_test"), expected)
+    assert_records_as_multiset(get_table(p, "dim_test"), expected)
 
     # assert child records
     expected = [
@@ -535,16 +560,18 @@ def test_record_reinsert(destination_config: DestinationTestConfiguration) -> No
         {"_dlt_root_id": get_row_hash(r2), "value": 2},
         {"_dlt_root_id": get_row_hash(r2), "value": 3},
     ]
-    assert_records_as_set(get_table(p, "dim_test__child"), expected)
+    assert_records_as_multiset(get_table(p, "dim_test__child"), expected)
 
 
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, subset=["duckdb"]),
+    _DUCKDB,
     ids=lambda x: x.name,
 )
-def test_validity_column_name_conflict(destination_config: DestinationTestConfiguration) -> None:
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
+def test_validity_column_name_conflict(
+    destination_config: DestinationTestConfiguration, scd2_pipeline: dlt.Pipeline
+) -> None:
+    p = scd2_pipeline
 
     @dlt.resource(
         table_name="dim_test",
@@ -558,9 +585,10 @@ def test_validity_column_name_conflict(destination_config: DestinationTestConfig
         yield data
 
     # a schema check against an items got dropped because it was very costly and done on each row
-    dim_snap = {"nk": 1, "foo": 1, "from": "X"}  # conflict on "from" column
-    p.run(r(dim_snap), **destination_config.run_kwargs)
-    dim_snap = {"nk": 1, "foo": 1, "to": 1}  # conflict on "to" column
+    dim_snap = [
+        {"nk": 1, "foo": 1, "from": "X"},  # conflict on "from" column
+        {"nk": 1, "foo": 1, "to": 1},  # conflict on "to" column
+    ]
     p.run(r(dim_snap), **destination_config.run_kwargs)
 
     # instead the variant columns got generated
@@ -572,7 +600,7 @@ def test_validity_column_name_conflict(destination_config: DestinationTestConfig
 
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, subset=["postgres"]),
+    _POSTGRES,
     ids=lambda x: x.name,
 )
 @pytest.mark.parametrize(
@@ -586,62 +614,71 @@ def test_validity_column_name_conflict(destination_config: DestinationTestConfig
         "9999-12-31T00:00:00",
         "9999-12-31T00:00:00+00:00",
         "9999-12-31T00:00:00+01:00",
-        "i_am_not_a_timestamp",
     ],
 )
 def test_active_record_timestamp(
     destination_config: DestinationTestConfiguration,
     active_record_timestamp: Optional[TAnyDateTime],
+    scd2_pipeline: dlt.Pipeline,
 ) -> None:
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
+    p = scd2_pipeline
 
-    context = does_not_raise()
-    if active_record_timestamp == "i_am_not_a_timestamp":
-        context = pytest.raises(ValueError)  # type: ignore[assignment]
+    @dlt.resource(
+        table_name="dim_test",
+        write_disposition={
+            "disposition": "merge",
+            "strategy": "scd2",
+            "active_record_timestamp": active_record_timestamp,
+        },
+    )
+    def r():
+        yield {"foo": "bar"}
+
+    p.run(r(), **destination_config.run_kwargs)
+    actual_active_record_timestamp = ensure_pendulum_datetime(
+        load_tables_to_dicts(p, "dim_test")["dim_test"][0]["_dlt_valid_to"]
+    )
+    assert actual_active_record_timestamp == ensure_pendulum_datetime(active_record_timestamp)
 
-    with context:
+
+@pytest.mark.no_load  # invalid hint is rejected by the decorator, nothing gets loaded
+def test_active_record_timestamp_invalid() -> None:
+    with pytest.raises(ValueError):
 
         @dlt.resource(
             table_name="dim_test",
             write_disposition={
                 "disposition": "merge",
                 "strategy": "scd2",
-                "active_record_timestamp": active_record_timestamp,
+                "active_record_timestamp": "i_am_not_a_timestamp",
             },
         )
         def r():
             yield {"foo": "bar"}
 
-        p.run(r(), **destination_config.run_kwargs)
-        actual_active_record_timestamp = ensure_pendulum_datetime(
-            load_tables_to_dicts(p, "dim_test")["dim_test"][0]["_dlt_valid_to"]
-        )
-        assert actual_active_record_timestamp == ensure_pendulum_datetime(active_record_timestamp)
-
 
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, subset=["duckdb"]),
+    _DUCKDB,
     ids=lambda x: x.name,
 )
 def test_boundary_timestamp(
-    destination_config: DestinationTestConfiguration,
+    destination_config: DestinationTestConfiguration, scd2_pipeline: dlt.Pipeline
 ) -> None:
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
+    p = scd2_pipeline
 
     ts1 = "2024-08-21T12:15:00+00:00"
     ts2 = "2024-08-22"
     ts3 = date(2024, 8, 20)  # earlier than ts1 and ts2
     ts4 = "i_am_not_a_timestamp"
-
-    @dlt.resource(
-        table_name="dim_test",
-        write_disposition={
-            "disposition": "merge",
-            "strategy": "scd2",
-            "boundary_timestamp": ts1,
-        },
+    wd_ts1, wd_ts2, wd_ts3, wd_ts4 = (
+        TMergeDispositionDict(disposition="merge", strategy="scd2", boundary_timestamp=ts)
+        for ts in (ts1, ts2, ts3, ts4)
     )
+    # validity timestamps as they are returned by `get_table`
+    ts1_naive, ts2_naive, ts3_naive = strip_timezone(ts1), strip_timezone(ts2), strip_timezone(ts3)
+
+    @dlt.resource(table_name="dim_test", write_disposition=wd_ts1)
     def r(data):
         yield data
 
@@ -655,19 +692,13 @@ def test_boundary_timestamp(
     assert load_table_counts(p, "dim_test")["dim_test"] == 2
     from_, to = DEFAULT_VALIDITY_COLUMN_NAMES
     expected = [
-        {**{from_: strip_timezone(ts1), to: None}, **l1_1},
-        {**{from_: strip_timezone(ts1), to: None}, **l1_2},
+        {**{from_: ts1_naive, to: None}, **l1_1},
+        {**{from_: ts1_naive, to: None}, **l1_2},
     ]
-    assert get_table(p, "dim_test", "nk") == expected
+    assert_records_as_multiset(get_table(p, "dim_test"), expected)
 
     # load 2 — different source records, different boundary timestamp
-    r.apply_hints(
-        write_disposition={
-            "disposition": "merge",
-            "strategy": "scd2",
-            "boundary_timestamp": ts2,
-        }
-    )
+    r.apply_hints(write_disposition=wd_ts2)
     dim_snap = [
         l2_1 := {"nk": 1, "foo": "bar"},  # natural key 1 updated
         # l1_2,  # natural key 2 no longer present
@@ -677,59 +708,50 @@ def test_boundary_timestamp(
     assert_load_info(info)
     assert load_table_counts(p, "dim_test")["dim_test"] == 4
     expected = [
-        {**{from_: strip_timezone(ts1), to: strip_timezone(ts2)}, **l1_1},  # retired
-        {**{from_: strip_timezone(ts1), to: strip_timezone(ts2)}, **l1_2},  # retired
-        {**{from_: strip_timezone(ts2), to: None}, **l2_1},  # new
-        {**{from_: strip_timezone(ts2), to: None}, **l2_3},  # new
+        {**{from_: ts1_naive, to: ts2_naive}, **l1_1},  # retired
+        {**{from_: ts1_naive, to: ts2_naive}, **l1_2},  # retired
+        {**{from_: ts2_naive, to: None}, **l2_1},  # new
+        {**{from_: ts2_naive, to: None}, **l2_3},  # new
     ]
-    assert_records_as_set(get_table(p, "dim_test"), expected)
+    assert_records_as_multiset(get_table(p, "dim_test"), expected)
 
     # load 3 — earlier boundary timestamp
     # we naively apply any valid timestamp
     # may lead to "valid from" > "valid to", as in this test case
-    r.apply_hints(
-        write_disposition={
-            "disposition": "merge",
-            "strategy": "scd2",
-            "boundary_timestamp": ts3,
-        }
-    )
+    r.apply_hints(write_disposition=wd_ts3)
     dim_snap = [l2_1]  # natural key 3 no longer present
     info = p.run(r(dim_snap), **destination_config.run_kwargs)
     assert_load_info(info)
     assert load_table_counts(p, "dim_test")["dim_test"] == 4
     expected = [
-        {**{from_: strip_timezone(ts1), to: strip_timezone(ts2)}, **l1_1},  # unchanged
-        {**{from_: strip_timezone(ts1), to: strip_timezone(ts2)}, **l1_2},  # unchanged
-        {**{from_: strip_timezone(ts2), to: None}, **l2_1},  # unchanged
-        {**{from_: strip_timezone(ts2), to: strip_timezone(ts3)}, **l2_3},  # retired
+        {**{from_: ts1_naive, to: ts2_naive}, **l1_1},  # unchanged
+        {**{from_: ts1_naive, to: ts2_naive}, **l1_2},  # unchanged
+        {**{from_: ts2_naive, to: None}, **l2_1},  # unchanged
+        {**{from_: ts2_naive, to: ts3_naive}, **l2_3},  # retired
     ]
-    assert_records_as_set(get_table(p, "dim_test"), expected)
+    assert_records_as_multiset(get_table(p, "dim_test"), expected)
 
     # invalid boundary timestamp should raise error
     with pytest.raises(ValueError):
-        r.apply_hints(
-            write_disposition={
-                "disposition": "merge",
-                "strategy": "scd2",
-                "boundary_timestamp": ts4,
-            }
-        )
+        r.apply_hints(write_disposition=wd_ts4)
 
 
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, subset=["duckdb"]),
+    _DUCKDB,
     ids=lambda x: x.name,
 )
 @pytest.mark.parametrize("item_type", ["pandas", "arrow-table", "arrow-batch"])
 def test_arrow_custom_hash(
-    destination_config: DestinationTestConfiguration, item_type: TPythonTableFormat
+    destination_config: DestinationTestConfiguration,
+    item_type: TPythonTableFormat,
+    scd2_pipeline: dlt.Pipeline,
 ) -> None:
     table, _, _ = arrow_table_all_data_types(item_type, num_rows=100, include_json=False)
     orig_table: Any = None
     if item_type == "pandas":
-        orig_table = table.copy(deep=True)
+        # row hash is added as a new column so a shallow copy keeps the original columns
+        orig_table = table.copy(deep=False)
 
     from dlt.sources.helpers.transform import add_row_hash_to_table
 
@@ -744,7 +766,7 @@ def test_arrow_custom_hash(
             },
         ).add_map(add_row_hash_to_table("row_hash"))
 
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
+    p = scd2_pipeline
     info = p.run(_make_scd2_r(table), **destination_config.run_kwargs)
     assert_load_info(info)
     # make sure we have scd2 columns in schema
@@ -760,7 +782,10 @@ def test_arrow_custom_hash(
     # modify in place (pandas only)
     if item_type == "pandas":
         table = orig_table
-        orig_table = table.copy(deep=True)
+        orig_table = table.copy(deep=False)
+        # only the first column is modified below, give the copy its own data for it
+        first_column = orig_table.columns[0]
+        orig_table[first_column] = orig_table[first_column].copy()
         info = p.run(_make_scd2_r(table), **destination_config.run_kwargs)
         assert_load_info(info)
         # no changes (hopefully hash is deterministic)
@@ -776,11 +801,13 @@ def test_arrow_custom_hash(
 
 @pytest.mark.parametrize(
     "destination_config",
-    destinations_configs(default_sql_configs=True, subset=["duckdb"]),
+    _DUCKDB,
     ids=lambda x: x.name,
 )
-def test_user_provided_row_hash(destination_config: DestinationTestConfiguration) -> None:
-    p = destination_config.setup_pipeline("abstract", dev_mode=True)
+def test_user_provided_row_hash(
+    destination_config: DestinationTestConfiguration, scd2_pipeline: dlt.Pipeline
+) -> None:
+    p = scd2_pipeline
 
     @dlt.resource(
         table_name="dim_test",
@@ -817,21 +844,27 @@ def test_user_provided_row_hash(destination_config: DestinationTestConfiguration
 
     # assert load results
     from_, to = DEFAULT_VALIDITY_COLUMN_NAMES
-    assert get_table(p, "dim_test", "c1") == [
-        {from_: ts_1, to: ts_2, "nk": 2, "c1": "bar", "row_hash": "mocked_hash_2"},
-        {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", "row_hash": "mocked_hash_1"},
-        {
-            from_: ts_2,
-            to: None,
-            "nk": 1,
-            "c1": "foo_upd",
-            "row_hash": "mocked_hash_1_upd",
-        },
-    ]
+    assert_records_as_multiset(
+        get_table(p, "dim_test"),
+        [
+            {from_: ts_1, to: ts_2, "nk": 2, "c1": "bar", "row_hash": "mocked_hash_2"},
+            {from_: ts_1, to: ts_2, "nk": 1, "c1": "foo", "row_hash": "mocked_hash_1"},
+            {
+                from_: ts_2,
+                to: None,
+                "nk": 1,
+                "c1": "foo_upd",
+                "row_hash": "mocked_hash_1_upd",
+            },
+        ],
+    )
     # root id is not deterministic when a user provided row hash is used
-    assert get_table(p, "dim_test__c2", "value", include_root_id=False) == [
-        {"value": 1},
-        {"value": 1},
-        {"value": 2},
-        {"value": 3},
-    ]
+    assert_records_as_multiset(
+        get_table(p, "dim_test__c2", include_root_id=False),
+        [
+            {"value": 1},
+            {"value": 1},
+            {"value": 2},
+            {"value": 3},
+        ],
+    )
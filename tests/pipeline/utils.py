@@ -3,6 +3,7 @@ import pytest
 import random
 from os import environ
 import io
+from collections import Counter
 
 import dlt
 from dlt.common import json, sleep
@@ -266,6 +267,15 @@ def assert_records_as_set(actual: List[Dict[str, Any]], expected: List[Dict[str,
     assert actual_set == expected_set
 
 
+def assert_records_as_multiset(
+    actual: List[Dict[str, Any]], expected: List[Dict[str, Any]]
+) -> None:
+    """Compares two lists of dicts regardless of order, duplicated records must match in number"""
+    actual_counts = Counter(frozenset(dict_.items()) for dict_ in actual)
+    expected_counts = Counter(frozenset(dict_.items()) for dict_ in expected)
+    assert actual_counts == expected_counts
+
+
 def assert_only_table_columns(
     p: dlt.Pipeline, table_name: str, expected_columns: Sequence[str], schema_name: str = None
 ) -> None: